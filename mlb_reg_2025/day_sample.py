@@ -5,10 +5,13 @@ Shows games for a random day from the MLB schedule
 """
 
 import argparse
+import os
+import sys
 from datetime import datetime
+from functools import lru_cache
 from bs4 import BeautifulSoup
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 # =============================================================================
 # CONFIGURATION
@@ -30,6 +33,21 @@ DATE_EXAMPLES = [
     "June 20, 2025"
 ]
 
+# =============================================================================
+# COMPILED PATTERNS
+# =============================================================================
+
+TEAM_HREF_RE = re.compile(r'/teams/[A-Z]+/')
+SCORE_RE = re.compile(r'\((\d+)\)')
+
+# Today's Games header and upcoming game entries (with Preview links)
+TODAY_HEADER_RE = re.compile(r'<h3><span id=\'today\'>Today\'s Games</span></h3>')
+GAME_BLOCK_RE = re.compile(r'<p class="game">\s*<span tz="E"><strong>([^<]+)</strong></span>\s*<a href="([^"]+)">([^<]+)</a>\s*@\s*<a href="([^"]+)">([^<]+)</a>\s*&nbsp;&nbsp;&nbsp;&nbsp;<em><a href="([^"]+)">Preview</a></em>\s*</p>')
+BOXSCORE_TEAM_RE = re.compile(r'/([A-Z]+)2025')
+
+# Month, day (leading zeros dropped) and year in a lowercased date string
+DATE_KEY_RE = re.compile(r'\b([a-z]+)\s+0*(\d{1,2}),?\s+(\d{4})\b')
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -39,9 +57,6 @@ def update_todays_games(html_file_path: str):
     Replace 'Today's Games' section with current date format
     This updates the HTML file to use the current date instead of 'Today's Games'
     """
-    import re
-    from datetime import datetime
-    
     # Read the HTML file
     with open(html_file_path, 'r', encoding='utf-8') as file:
         content = file.read()
@@ -51,15 +66,10 @@ def update_todays_games(html_file_path: str):
     current_date = now.strftime("%A, %B %-d, %Y")
     print(f"Current date: {current_date}")
     
-    # Pattern to match Today's Games header
-    pattern = r'<h3><span id=\'today\'>Today\'s Games</span></h3>'
     replacement = f'<h3>{current_date}</h3>'
     
     # Replace the header
-    new_content = re.sub(pattern, replacement, content)
-    
-    # Pattern to match game entries with times (Preview links)
-    game_pattern = r'<p class="game">\s*<span tz="E"><strong>([^<]+)</strong></span>\s*<a href="([^"]+)">([^<]+)</a>\s*@\s*<a href="([^"]+)">([^<]+)</a>\s*&nbsp;&nbsp;&nbsp;&nbsp;<em><a href="([^"]+)">Preview</a></em>\s*</p>'
+    new_content = TODAY_HEADER_RE.sub(replacement, content)
     
     def replace_game_with_scores(match):
         time = match.group(1)
@@ -71,13 +81,13 @@ def update_todays_games(html_file_path: str):
         
         # Convert preview URL to boxscore URL format
         boxscore_url = preview_url.replace('/previews/', '/boxes/')
-        boxscore_url = re.sub(r'/([A-Z]+)2025', r'/\1/\12025', boxscore_url)
+        boxscore_url = BOXSCORE_TEAM_RE.sub(r'/\1/\12025', boxscore_url)
         
         # Create new game format with scores (TBD for future games)
         return f'<p class="game">\n\n <a href="{team1_url}">{team1_name}</a>\n (TBD)\n @\n <strong> <a href="{team2_url}">{team2_name}</a>\n (TBD)</strong>\n &nbsp;&nbsp;&nbsp;&nbsp;<em><a href="{boxscore_url}">Boxscore</a></em>\n </p>'
     
     # Replace game entries
-    new_content = re.sub(game_pattern, replace_game_with_scores, new_content)
+    new_content = GAME_BLOCK_RE.sub(replace_game_with_scores, new_content)
     
     # Write the updated content back to the file
     with open(html_file_path, 'w', encoding='utf-8') as file:
@@ -86,72 +96,87 @@ def update_todays_games(html_file_path: str):
     print(f"✅ Successfully replaced 'Today's Games' with '{current_date}'")
     print("✅ Updated game format to match other dates (with scores instead of times)")
 
+def normalize_date(date_text: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Reduce a date to a (month, day, year) key, e.g. "Monday, August 4, 2025"
+    and "August 04, 2025" both become ('august', '4', '2025')
+    Returns None if the text has no month, day and year
+    """
+    match = DATE_KEY_RE.search(date_text.lower())
+    return match.groups() if match else None
+
+@lru_cache(maxsize=4)
+def _load_sections_cached(html_file_path: str, mtime: float) -> Dict:
+    """Parse the schedule and index its game sections; cached per file modification time"""
+    with open(html_file_path, 'r', encoding='utf-8') as file:
+        soup = BeautifulSoup(file, 'lxml')
+    
+    # Group the game paragraphs by the div that directly contains them, so only
+    # sections with actual games (not just headers or wrapper divs) are kept
+    sections = {}
+    for game_p in soup.find_all('p', class_='game'):
+        section = game_p.parent
+        if id(section) not in sections:
+            sections[id(section)] = (section, [])
+        sections[id(section)][1].append(game_p)
+    
+    # Headers without a recognisable date (e.g. "Today's Games") are keyed by their text
+    sections_by_date = {}
+    for section, game_paragraphs in sections.values():
+        date_header = section.find('h3')
+        date = date_header.get_text(strip=True) if date_header else "Unknown Date"
+        key = normalize_date(date) or date.lower()
+        sections_by_date.setdefault(key, []).append({
+            'date': date,
+            'section': section,
+            'games': game_paragraphs
+        })
+    
+    return sections_by_date
+
+def _load_sections(html_file_path: str) -> Dict:
+    """
+    Get the schedule's game sections keyed by normalize_date(), in document order
+    The file is only re-parsed when it has been modified (e.g. by update_todays_games)
+    """
+    return _load_sections_cached(html_file_path, os.path.getmtime(html_file_path))
+
 # =============================================================================
 # MAIN FUNCTIONS
 # =============================================================================
 
-def get_games_for_date(html_file_path: str, target_date: str) -> List[Dict]:
+def get_games_for_date(html_file_path: str, target_date: str, include_raw_html: bool = False) -> List[Dict]:
     """
     Get games for a specific date from the MLB schedule
     Args:
         html_file_path: Path to the HTML file
         target_date: Specific date to search for (format: "Month Day, Year")
+        include_raw_html: Whether to keep each game's HTML under 'raw_html'
     Returns: List of dictionaries with date and games
     """
-    with open(html_file_path, 'r', encoding='utf-8') as file:
-        soup = BeautifulSoup(file, 'html.parser')
-    
-    # Find all sections with dates and games
-    sections = soup.find_all('div')
-    
-    # Filter sections that have actual games (not just headers)
-    game_sections = []
-    for section in sections:
-        game_paragraphs = section.find_all('p', class_='game')
-        if game_paragraphs:
-            date_header = section.find('h3')
-            date = date_header.get_text(strip=True) if date_header else "Unknown Date"
-            game_sections.append({
-                'date': date,
-                'section': section,
-                'games': game_paragraphs
-            })
+    sections_by_date = _load_sections(html_file_path)
     
     # Search for the specific date (more precise matching)
-    target_date_lower = target_date.lower()
-    matching_sections = []
-    
-    for section in game_sections:
-        section_date_lower = section['date'].lower()
-        
-        # Extract month and day from target date
-        target_parts = target_date_lower.split()
-        if len(target_parts) >= 3:  # Should have "August", "04", "2025"
-            target_month = target_parts[0]
-            target_day = target_parts[1].replace(',', '')
-            target_year = target_parts[2]
-            
-            # Remove leading zero from day if present
-            if target_day.startswith('0'):
-                target_day = target_day[1:]
-            
-            # Check if this section contains the exact month, day, and year
-            # Use word boundaries to avoid partial matches
-            import re
-            pattern = rf'\b{target_month}\b.*\b{target_day}\b.*\b{target_year}\b'
-            if re.search(pattern, section_date_lower):
-                matching_sections.append(section)
-        else:
-            # Fallback to simple substring matching
-            if target_date_lower in section_date_lower:
-                matching_sections.append(section)
+    target_key = normalize_date(target_date)
+    if target_key is not None:
+        matching_sections = sections_by_date.get(target_key, [])
+    else:
+        # Fallback to simple substring matching
+        target_date_lower = target_date.lower()
+        matching_sections = [
+            section
+            for sections in sections_by_date.values()
+            for section in sections
+            if target_date_lower in section['date'].lower()
+        ]
     
     if matching_sections:
         selected_days = matching_sections
     else:
         print(f"Date '{target_date}' not found in schedule.")
         print("Available dates include:")
-        for section in game_sections[:5]:  # Show first 5 available dates
+        available = [section for sections in sections_by_date.values() for section in sections]
+        for section in available[:5]:  # Show first 5 available dates
             print(f"  - {section['date']}")
         return []
     
@@ -160,6 +185,10 @@ def get_games_for_date(html_file_path: str, target_date: str) -> List[Dict]:
         day_games = []
         
         for game_p in day_data['games']:
+            # Walk the paragraph's strings once and derive both text forms from them
+            game_strings = list(game_p.strings)
+            game_text = ''.join(game_strings)
+            
             game_data = {
                 'team1': None,
                 'team2': None,
@@ -167,22 +196,23 @@ def get_games_for_date(html_file_path: str, target_date: str) -> List[Dict]:
                 'score2': None,
                 'time': None,
                 'game_type': None,
-                'raw_html': str(game_p),
-                'text_content': game_p.get_text(strip=True)
+                'text_content': ''.join(s.strip() for s in game_strings)
             }
             
+            if include_raw_html:
+                game_data['raw_html'] = str(game_p)
+            
             # Extract time if present
             time_span = game_p.find('span', attrs={'tz': 'E'})
             if time_span:
                 game_data['time'] = time_span.get_text(strip=True)
             
             # Extract game type (Spring, Regular, etc.)
-            game_type_span = game_p.find('span')
-            if game_type_span and 'Spring' in game_type_span.get_text():
+            if '(Spring)' in game_text:
                 game_data['game_type'] = 'Spring'
             
             # Find all team links
-            team_links = game_p.find_all('a', href=re.compile(r'/teams/[A-Z]+/'))
+            team_links = game_p.find_all('a', href=TEAM_HREF_RE)
             
             if len(team_links) >= 2:
                 # Extract team names
@@ -190,8 +220,7 @@ def get_games_for_date(html_file_path: str, target_date: str) -> List[Dict]:
                 game_data['team2'] = team_links[1].get_text(strip=True)
                 
                 # Extract scores from the entire game paragraph text
-                game_text = game_p.get_text()
-                scores = re.findall(r'\((\d+)\)', game_text)
+                scores = SCORE_RE.findall(game_text)
                 if len(scores) >= 2:
                     game_data['score1'] = int(scores[0])
                     game_data['score2'] = int(scores[1])
@@ -211,47 +240,52 @@ def display_games(html_file_path: str, target_date: str):
     """
     Display games for a specific date
     """
-    print("=" * 80)
-    print(f"MLB SCHEDULE FOR: {target_date.upper()}")
-    print("=" * 80)
+    # Header goes out before the lookup so its "not found" messages follow it
+    sys.stdout.write("\n".join([
+        "=" * 80,
+        f"MLB SCHEDULE FOR: {target_date.upper()}",
+        "=" * 80,
+    ]) + "\n")
     
+    # Everything else is collected and written in one go
+    out = []
     try:
         days_data = get_games_for_date(html_file_path, target_date)
         
         for i, day_data in enumerate(days_data, 1):
-            print(f"\n📅 DAY {i}: {day_data['date']}")
-            print(f"   Games found: {len(day_data['games'])}")
-            print("-" * 60)
+            out.append(f"\n📅 DAY {i}: {day_data['date']}")
+            out.append(f"   Games found: {len(day_data['games'])}")
+            out.append("-" * 60)
             
             # Show all games if MAX_GAMES_PER_DAY is None, otherwise limit to the specified number
             games_to_show = day_data['games'] if MAX_GAMES_PER_DAY is None else day_data['games'][:MAX_GAMES_PER_DAY]
             
             for j, game in enumerate(games_to_show, 1):
-                print(f"\n   Game {j}:")
-                print(f"   Teams: {game['team1']} @ {game['team2']}")
+                out.append(f"\n   Game {j}:")
+                out.append(f"   Teams: {game['team1']} @ {game['team2']}")
                 
                 if game['score1'] is not None and game['score2'] is not None:
-                    print(f"   Score: {game['score1']} - {game['score2']}")
+                    out.append(f"   Score: {game['score1']} - {game['score2']}")
                 else:
-                    print(f"   Score: TBD")
+                    out.append(f"   Score: TBD")
                 
                 if game['time']:
-                    print(f"   Time: {game['time']}")
+                    out.append(f"   Time: {game['time']}")
                 
                 if game['game_type'] and SHOW_GAME_TYPE:
-                    print(f"   Type: {game['game_type']}")
+                    out.append(f"   Type: {game['game_type']}")
                 
                 if SHOW_RAW_TEXT:
-                    print(f"   Raw text: {game['text_content']}")
+                    out.append(f"   Raw text: {game['text_content']}")
             
             # Show message if there are more games than what we displayed
             if MAX_GAMES_PER_DAY is not None and len(day_data['games']) > MAX_GAMES_PER_DAY:
                 remaining = len(day_data['games']) - MAX_GAMES_PER_DAY
-                print(f"\n   ... and {remaining} more games")
+                out.append(f"\n   ... and {remaining} more games")
         
-        print(f"\n" + "=" * 80)
-        print("SUMMARY")
-        print("=" * 80)
+        out.append(f"\n" + "=" * 80)
+        out.append("SUMMARY")
+        out.append("=" * 80)
         
         total_games = sum(len(day['games']) for day in days_data)
         completed_games = sum(
@@ -260,16 +294,18 @@ def display_games(html_file_path: str, target_date: str):
         )
         future_games = total_games - completed_games
         
-        print(f"Total days shown: {len(days_data)}")
-        print(f"Total games shown: {total_games}")
-        print(f"Completed games: {completed_games}")
-        print(f"Future games: {future_games}")
+        out.append(f"Total days shown: {len(days_data)}")
+        out.append(f"Total games shown: {total_games}")
+        out.append(f"Completed games: {completed_games}")
+        out.append(f"Future games: {future_games}")
         
     except FileNotFoundError:
-        print(f"Error: Could not find {html_file_path}")
-        print("Make sure the file exists in the html/ directory")
+        out.append(f"Error: Could not find {html_file_path}")
+        out.append("Make sure the file exists in the html/ directory")
     except Exception as e:
-        print(f"Error analyzing HTML: {e}")
+        out.append(f"Error analyzing HTML: {e}")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 def main():
     """Main function to show games for a specific date or update Today's Games"""
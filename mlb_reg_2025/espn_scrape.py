@@ -1,23 +1,35 @@
+import mmap
+import os
 import re
 
+# Bounded quantifiers keep a missing closing brace from backtracking across the whole page
+WN_PRB_RE = re.compile(rb'"wnPrb":\s*\{\s*"pts":\s*\{[^}]{0,2000}?:\s*([\d.]+)')
+MTCH_RE = re.compile(rb'"mtchpPrdctr":\s*\{\s*"teams":\s*\[\s*\{[^}]{0,2000}?"value":\s*([\d.]+)')
+
 def extract_initial_win_prob(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    # Try to find win probability from "wnPrb"
-    probs = re.findall(r'"wnPrb":\s*\{\s*"pts":\s*\{([^}]*)\}', content)
-    if probs:
-        match = re.search(r':\s*([\d.]+)', probs[0])
+    # Map the page instead of reading it so the patterns scan the page cache directly
+    with open(filepath, 'rb') as f:
+        # An empty page (e.g. a failed download) can't be mapped and has nothing to find
+        if os.fstat(f.fileno()).st_size == 0:
+            print("Win Probability not found.")
+            return None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        # Try to find win probability from "wnPrb"
+        match = WN_PRB_RE.search(mm)
         if match:
             win_prob = float(match.group(1))
             print(f"Win Probability: {win_prob}")
             return win_prob
-        
-    # If not found, try to find from "mtchpPrdctr"
-    mtch = re.search(r'"mtchpPrdctr":\s*\{\s*"teams":\s*\[\s*\{[^}]*"value":\s*([\d.]+)', content)
-    if mtch:
-        win_prob = float(mtch.group(1))
-        print(f"Predicted Win Probability: {win_prob}")
-        return win_prob
+
+        # If not found, try to find from "mtchpPrdctr"
+        mtch = MTCH_RE.search(mm)
+        if mtch:
+            win_prob = float(mtch.group(1))
+            print(f"Predicted Win Probability: {win_prob}")
+            return win_prob
+    finally:
+        mm.close()
     print("Win Probability not found.")
     return None
 
@@ -4,19 +4,70 @@ Extracts all games from MLB-schedule.shtml using the approach from day_sample.py
 """
 
 import re
-from bs4 import BeautifulSoup
-import csv
-import json
+from lxml import etree
+import orjson
 import os
 from datetime import datetime
 from typing import List, Dict, Optional
 import pandas as pd
 
-def get_all_games_from_schedule(html_file_path: str) -> List[Dict]:
-    """Extract all games from the MLB schedule HTML file"""
-    with open(html_file_path, 'r', encoding='utf-8') as file:
-        soup = BeautifulSoup(file, 'html.parser')
+# Compiled once and reused for every game paragraph in the schedule
+TIME_XPATH = etree.XPath(".//span[@tz='E']")
+TEAM_XPATH = etree.XPath(".//a[re:test(@href, '/teams/[A-Z]+/')]",
+                         namespaces={'re': 'http://exslt.org/regular-expressions'})
+
+SCORE_RE = re.compile(r'\((\d+)\)')
+# A run of tags and/or whitespace; group 1 is set when the run contains any whitespace
+CLEAN_RE = re.compile(r'(?:<[^>]+>|(\s))+')
+
+def _element_text(element) -> str:
+    """Concatenated text of an element and its descendants, like BeautifulSoup's get_text()"""
+    return "".join(element.itertext())
+
+def _extract_game(element, current_date: str, include_raw_html: bool = False) -> Optional[Dict]:
+    """Build the game record for a <p class="game"> element, or None if it isn't a regular season game"""
+    game_text = _element_text(element)
+    if '(Spring)' in game_text:
+        return None
+    
+    game_data = {
+        'date': current_date,
+        'team1': None,
+        'team2': None,
+        'score1': None,
+        'score2': None,
+        'time': None,
+        'game_type': None,
+        'text_content': game_text
+    }
+    
+    # Serialising the element back to HTML is costly, so only do it on request
+    if include_raw_html:
+        game_data['raw_html'] = etree.tostring(element, encoding='unicode', method='html', with_tail=False)
+    
+    time_spans = TIME_XPATH(element)
+    if time_spans:
+        game_data['time'] = _element_text(time_spans[0]).strip()
     
+    team_links = TEAM_XPATH(element)
+    
+    if len(team_links) < 2:
+        return None
+    
+    game_data['team1'] = _element_text(team_links[0]).strip()
+    game_data['team2'] = _element_text(team_links[1]).strip()
+    
+    scores = SCORE_RE.findall(game_text)
+    if len(scores) >= 2:
+        game_data['score1'] = int(scores[0])
+        game_data['score2'] = int(scores[1])
+    elif len(scores) == 1:
+        game_data['score1'] = int(scores[0])
+    
+    return game_data
+
+def get_all_games_from_schedule(html_file_path: str, include_raw_html: bool = False) -> List[Dict]:
+    """Extract all games from the MLB schedule HTML file, optionally keeping each game's raw HTML"""
     games = []
     current_date = None
 
@@ -24,54 +75,36 @@ def get_all_games_from_schedule(html_file_path: str) -> List[Dict]:
     today_str = datetime.now().strftime("%A, %B %-d, %Y").replace(" 0", " ")
     # On Mac, %-d works. On Windows, use %#d.
 
-    for element in soup.find_all(['h3', 'p']):
-        if element.name == 'h3':
-            date_text = element.get_text(strip=True)
+    # Stream h3/p elements in document order and drop each one once handled,
+    # so the parsed tree never grows to the size of the whole schedule
+    context = etree.iterparse(html_file_path, events=('end',), tag=('h3', 'p'),
+                              html=True, encoding='utf-8')
+    for _, element in context:
+        if element.tag == 'h3':
+            date_text = _element_text(element).strip()
             if date_text == "Today's Games":
                 current_date = today_str
             elif date_text and ',' in date_text and '2025' in date_text:
                 current_date = date_text
-        elif element.name == 'p' and 'game' in element.get('class', []):
-            if not current_date:
-                continue
-                
-            if '(Spring)' in element.get_text():
-                continue
-            
-            game_data = {
-                'date': current_date,
-                'team1': None,
-                'team2': None,
-                'score1': None,
-                'score2': None,
-                'time': None,
-                'game_type': None,
-                'raw_html': str(element),
-                'text_content': element.get_text()
-            }
-            
-            time_span = element.find('span', attrs={'tz': 'E'})
-            if time_span:
-                game_data['time'] = time_span.get_text(strip=True)
-            
-            team_links = element.find_all('a', href=re.compile(r'/teams/[A-Z]+/'))
-            
-            if len(team_links) >= 2:
-                game_data['team1'] = team_links[0].get_text(strip=True)
-                game_data['team2'] = team_links[1].get_text(strip=True)
-                
-                game_text = element.get_text()
-                scores = re.findall(r'\((\d+)\)', game_text)
-                if len(scores) >= 2:
-                    game_data['score1'] = int(scores[0])
-                    game_data['score2'] = int(scores[1])
-                elif len(scores) == 1:
-                    game_data['score1'] = int(scores[0])
-                
-                games.append(game_data)
+        elif current_date:
+            # Game paragraphs are almost always exactly class="game", so only
+            # split the attribute for the rare multi-class case
+            classes = element.get('class')
+            if classes == 'game' or (classes and 'game' in classes.split()):
+                game_data = _extract_game(element, current_date, include_raw_html)
+                if game_data:
+                    games.append(game_data)
+        
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
     
     return games
 
+def _clean_run(match) -> str:
+    """Drop tag-only runs and collapse anything containing whitespace to a single space"""
+    return '' if match.group(1) is None else ' '
+
 def save_to_csv(games: List[Dict], output_file: str):
     """Save games data to CSV file"""
     if not games:
@@ -80,21 +113,12 @@ def save_to_csv(games: List[Dict], output_file: str):
     
     fieldnames = ['date', 'team1', 'team2', 'score1', 'score2', 'time', 'game_type', 'text_content']
     
-    clean_games = []
-    for game in games:
-        clean_game = {k: v for k, v in game.items() if k in fieldnames}
-        
-        if 'text_content' in game:
-            clean_text = re.sub(r'<[^>]+>', '', game['text_content'])
-            clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-            clean_game['text_content'] = clean_text
-        
-        clean_games.append(clean_game)
+    # object dtype keeps scores as ints with blanks for missing values
+    df = pd.DataFrame(games, columns=fieldnames, dtype=object)
+    df['text_content'] = df['text_content'].str.replace(CLEAN_RE, _clean_run, regex=True).str.strip()
     
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(clean_games)
+    # Match csv.DictWriter's line endings so existing files diff cleanly
+    df.to_csv(output_file, index=False, encoding='utf-8', lineterminator='\r\n')
     
     print(f"Saved {len(games)} games to {output_file}")
 
@@ -104,27 +128,34 @@ def save_to_json(games: List[Dict], output_file: str):
         print("No games found to save")
         return
     
-    with open(output_file, 'w', encoding='utf-8') as jsonfile:
-        json.dump(games, jsonfile, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as jsonfile:
+        jsonfile.write(orjson.dumps(games, option=orjson.OPT_INDENT_2))
     
     print(f"Saved {len(games)} games to {output_file}")
 
 def update_csv_from_html(html_file_path: str, csv_file_path: str = 'mlb_schedule_all_games.csv', 
                         json_file_path: str = 'mlb_schedule_all_games.json', 
-                        force_update: bool = False):
+                        force_update: bool = False, include_raw_html: bool = False):
     """Update CSV file when MLB schedule HTML changes"""
     print("🔄 Checking for updates to MLB schedule...")
     print("=" * 60)
     
-    if not os.path.exists(html_file_path):
+    # One stat() per file covers both the existence check and the mtime
+    try:
+        html_stat = os.stat(html_file_path)
+    except OSError:
         print(f"❌ Error: HTML file not found at {html_file_path}")
         return False
     
-    html_mtime = os.path.getmtime(html_file_path)
+    html_mtime = html_stat.st_mtime
     html_mtime_str = datetime.fromtimestamp(html_mtime).strftime('%Y-%m-%d %H:%M:%S')
     
-    csv_exists = os.path.exists(csv_file_path)
-    csv_mtime = os.path.getmtime(csv_file_path) if csv_exists else 0
+    try:
+        csv_mtime = os.stat(csv_file_path).st_mtime
+        csv_exists = True
+    except OSError:
+        csv_mtime = 0
+        csv_exists = False
     csv_mtime_str = datetime.fromtimestamp(csv_mtime).strftime('%Y-%m-%d %H:%M:%S')
     
     print(f"📄 HTML file: {html_file_path}")
@@ -138,7 +169,7 @@ def update_csv_from_html(html_file_path: str, csv_file_path: str = 'mlb_schedule
     
     print(f"\n🔄 Extracting games from updated HTML...")
     try:
-        games = get_all_games_from_schedule(html_file_path)
+        games = get_all_games_from_schedule(html_file_path, include_raw_html)
         
         if not games:
             print("❌ No games found in the HTML file")
@@ -189,6 +220,8 @@ def main():
                        help='Path to save CSV file (default: mlb_schedule_all_games.csv)')
     parser.add_argument('--json-file', type=str, default='mlb_schedule_all_games.json',
                        help='Path to save JSON file (default: mlb_schedule_all_games.json)')
+    parser.add_argument('--raw-html', action='store_true',
+                       help='Include each game\'s raw HTML in the JSON output')
     
     args = parser.parse_args()
     
@@ -197,7 +230,8 @@ def main():
             html_file_path=args.html_file,
             csv_file_path=args.csv_file,
             json_file_path=args.json_file,
-            force_update=args.force
+            force_update=args.force,
+            include_raw_html=args.raw_html
         )
         
         if success:
@@ -209,7 +243,7 @@ def main():
         print("=" * 60)
         
         try:
-            games = get_all_games_from_schedule(args.html_file)
+            games = get_all_games_from_schedule(args.html_file, args.raw_html)
             
             if not games:
                 print("No games found in the HTML file")
@@ -1,7 +1,5 @@
-import json
-import re
 import csv
-from datetime import datetime
+import orjson
 
 # Add your team name to code mapping here
 TEAM_CODE_MAP = {
@@ -73,48 +71,57 @@ TEAM_CODE_MAP = {
     "Washington": "WSH"
 }
 
+NEXT_DATA_OPEN = b'<script id="__NEXT_DATA__" type="application/json">'
+NEXT_DATA_CLOSE = b'</script>'
+
+def _game_row(game):
+    """Build the output row for one game in the odds table"""
+    get_code = TEAM_CODE_MAP.get
+    gv = game["gameView"]
+    away = gv["awayTeam"]
+    home = gv["homeTeam"]
+    away_starter = gv["awayStarter"]
+    home_starter = gv["homeStarter"]
+    # Convert date from yyyy-mm-dd to dd-mm-yyyy
+    y, m, d = gv["startDate"][:10].split("-")
+    team1_full = away["displayName"]
+    team2_full = home["displayName"]
+    # Find bet365 odds
+    bet365 = next((o for o in game["oddsViews"] if o and o.get("sportsbook") == "bet365"), None)
+    if bet365:
+        odds = bet365["currentLine"]
+        away_odds = odds['awayOdds']
+        home_odds = odds['homeOdds']
+    else:
+        away_odds = "N/A"
+        home_odds = "N/A"
+    return {
+        "date": f"{d}-{m}-{y}",
+        "team1": get_code(team1_full, team1_full),
+        "team2": get_code(team2_full, team2_full),
+        "pitcher1": f"{away_starter['firstName']} {away_starter['lastName']}",
+        "pitcher2": f"{home_starter['firstName']} {home_starter['lastName']}",
+        "away_odds": away_odds,
+        "home_odds": home_odds
+    }
+
 def extract_odds_from_html(filepath):
-    with open(filepath, "r", encoding="utf-8") as f:
+    # Kept as bytes: orjson decodes the JSON island directly, so the page is never decoded
+    with open(filepath, "rb") as f:
         html = f.read()
 
-    match = re.search(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', html, re.DOTALL)
-    if not match:
+    start = html.find(NEXT_DATA_OPEN)
+    if start == -1:
+        raise ValueError("Could not find embedded JSON data in HTML.")
+    start += len(NEXT_DATA_OPEN)
+    end = html.find(NEXT_DATA_CLOSE, start)
+    if end == -1:
         raise ValueError("Could not find embedded JSON data in HTML.")
 
-    data = json.loads(match.group(1))
+    data = orjson.loads(html[start:end])
     games = data["props"]["pageProps"]["oddsTables"][0]["oddsTableModel"]["gameRows"]
 
-    results = []
-    for game in games:
-        gv = game["gameView"]
-        # Convert date from yyyy-mm-dd to dd-mm-yyyy
-        date_iso = gv["startDate"][:10]
-        date = datetime.strptime(date_iso, "%Y-%m-%d").strftime("%d-%m-%Y")
-        team1_full = gv["awayTeam"]["displayName"]
-        team2_full = gv["homeTeam"]["displayName"]
-        team1 = TEAM_CODE_MAP.get(team1_full, team1_full)
-        team2 = TEAM_CODE_MAP.get(team2_full, team2_full)
-        pitcher1 = f"{gv['awayStarter']['firstName']} {gv['awayStarter']['lastName']}"
-        pitcher2 = f"{gv['homeStarter']['firstName']} {gv['homeStarter']['lastName']}"
-        # Find bet365 odds
-        bet365 = next((o for o in game["oddsViews"] if o and o.get("sportsbook") == "bet365"), None)
-        if bet365:
-            odds = bet365["currentLine"]
-            away_odds = odds['awayOdds']
-            home_odds = odds['homeOdds']
-        else:
-            away_odds = "N/A"
-            home_odds = "N/A"
-        results.append({
-            "date": date,
-            "team1": team1,
-            "team2": team2,
-            "pitcher1": pitcher1,
-            "pitcher2": pitcher2,
-            "away_odds": away_odds,
-            "home_odds": home_odds
-        })
-    return results
+    return [_game_row(game) for game in games]
 
 def save_to_csv(data, csv_path):
     if not data: